@@ -3,10 +3,15 @@ import argparse
 import json
 import logging
 import os
+import pickle
 import sys
+import threading
+import time
 
 import pandas as pd
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from difflib import SequenceMatcher
+from functools import lru_cache
 from heapq import nlargest as _nlargest
 
 from target_netsuite.netsuite import NetSuite
@@ -15,9 +20,51 @@ from netsuitesdk.internal.exceptions import NetSuiteRequestError
 
 logger = logging.getLogger("target-netsuite")
 logging.basicConfig(
-    level=logging.DEBUG, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 
+ns_client_lock = threading.Lock()
+reference_cache_lock = threading.Lock()
+
+# Reference data that is skipped with a warning when NetSuite refuses it
+OPTIONAL_REFERENCE_DATA = ("Locations", "Customer")
+
+REQUIRED_COLS = [
+    "Transaction Date",
+    "Journal Entry Id",
+    "Customer Name",
+    "Class",
+    "Account Number",
+    "Account Name",
+    "Posting Type",
+    "Description",
+]
+
+# Columns read from the CSV, any other column is skipped while parsing
+INPUT_COLS = set(REQUIRED_COLS + [
+    "Amount",
+    "Location",
+    "Department",
+    "Subsidiary",
+    "Currency",
+    "JournalDesc",
+])
+
+# Account columns added to the CSV by join_accounts
+ACCOUNT_REF_COLS = ["acctName", "acctExternalId", "acctInternalId", "acctSubsidiary"]
+
+INPUT_DTYPES = {
+    "Posting Type": "category",
+    "Class": "category",
+    "Department": "category",
+    "Location": "category",
+    "Currency": "category",
+    "Account Number": str,
+    "Account Name": str,
+    "Journal Entry Id": str,
+    "Description": str,
+}
+
 
 def get_close_matches(word, possibilities, n=20, cutoff=0.7):
     if not n >  0:
@@ -66,14 +113,21 @@ def parse_args():
 
 
 def get_ns_client(config):
-    ns_account = config.get("ns_account")
-    ns_consumer_key = config.get("ns_consumer_key")
-    ns_consumer_secret = config.get("ns_consumer_secret")
-    ns_token_key = config.get("ns_token_key")
-    ns_token_secret = config.get("ns_token_secret")
-    is_sandbox = config.get("is_sandbox")
+    # Reuse the connection when uploading again with the same credentials
+    with ns_client_lock:
+        return connect_ns_client(
+            config.get("ns_account"),
+            config.get("ns_consumer_key"),
+            config.get("ns_consumer_secret"),
+            config.get("ns_token_key"),
+            config.get("ns_token_secret"),
+            config.get("is_sandbox"),
+        )
+
 
-    logger.info(f"Starting netsuite connection")
+@lru_cache(maxsize=1)
+def connect_ns_client(ns_account, ns_consumer_key, ns_consumer_secret, ns_token_key, ns_token_secret, is_sandbox):
+    logger.info("Starting netsuite connection")
     ns = NetSuite(
         ns_account=ns_account,
         ns_consumer_key=ns_consumer_key,
@@ -84,204 +138,396 @@ def get_ns_client(config):
     )
 
     ns.connect_tba(caching=False)
-    logger.info(f"Successfully created netsuite connection..")
+    logger.info("Successfully created netsuite connection..")
     return ns
 
-def get_reference_data(ns_client, input_data):
-    logger.info(f"Readding data from API...")
-    reference_data = {}
+
+def drop_expired(cache, config):
+    # Only keep the entities fetched within the TTL
+    ttl = config.get("reference_cache_ttl_seconds", 86400)
+    now = time.time()
+    return {k: v for k, v in cache.items() if now - v[0] <= ttl}
+
+
+def get_reference_cache(ns_client, config):
+    # Keep the fetched entities on the connection for repeated uploads with the same client
+    with reference_cache_lock:
+        if ns_client.reference_cache is None:
+            ns_client.reference_cache = load_reference_cache(config)
+        else:
+            ns_client.reference_cache = drop_expired(ns_client.reference_cache, config)
+        return ns_client.reference_cache
+
+
+def get_cache_account(config):
+    # Same account id the NetSuite connection uses, sandboxes get the _SB1 suffix
+    ns_account = config.get("ns_account")
+    if ns_account is not None and config.get("is_sandbox") is True:
+        ns_account = ns_account + "_SB1"
+    return ns_account
+
+
+def load_reference_cache(config):
+    cache_path = config.get("reference_cache_path")
+    if not cache_path or not os.path.exists(cache_path):
+        return {}
 
     try:
-        if "Location" in input_data.columns:
-            if not input_data["Location"].dropna().empty:
-                reference_data["Locations"] = ns_client.entities["Locations"](ns_client.client).get_all(["name"])
-    except NetSuiteRequestError as e:
-        message = e.message.replace("error", "failure").replace("Error", "")
-        logger.warning(f"It was not possible to retrieve Locations data: {message}")
-    
+        with open(cache_path, "rb") as f:
+            cache = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError) as e:
+        logger.warning("Ignoring unreadable reference cache %s: %s", cache_path, e)
+        return {}
+
+    # Never reuse internalIds cached for another account
+    if not isinstance(cache, dict) or cache.get("account") != get_cache_account(config):
+        logger.warning("Ignoring reference cache %s written for another account", cache_path)
+        return {}
+
+    return drop_expired(cache.get("entities", {}), config)
+
+
+def save_reference_cache(config, cache):
+    cache_path = config.get("reference_cache_path")
+    if not cache_path:
+        return
+
     try:
-        if not input_data["Customer Name"].dropna().empty:
-            reference_data["Customer"] = ns_client.entities["Customer"](ns_client.client).get_all(["name", "companyName"])
-    except NetSuiteRequestError as e:
-        message = e.message.replace("error", "failure").replace("Error", "")
-        logger.warning(f"It was not possible to retrieve Customer data: {message}")
-    
+        with open(cache_path, "wb") as f:
+            pickle.dump({"account": get_cache_account(config), "entities": cache}, f)
+    except OSError as e:
+        logger.warning("It was not possible to write the reference cache %s: %s", cache_path, e)
+
+
+def get_entity(ns_client, cache, name, selected_fields=None, flatten=None):
+    if name in cache:
+        logger.info("Using cached %s data", name)
+        return cache[name][1]
+
+    entity = ns_client.entities[name](ns_client.client)
+    records = entity.get_all() if selected_fields is None else entity.get_all(selected_fields)
+    if flatten:
+        records = flatten(records)
+    cache[name] = (time.time(), records)
+    return records
+
+
+def fetch_reference_data(ns_client, cache, jobs, workers):
+    if not jobs:
+        return {}
+
+    # The searches are independent, so run them concurrently
+    with ThreadPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+        futures = {
+            name: executor.submit(get_entity, ns_client, cache, name, *job)
+            for name, job in jobs.items()
+        }
+
+    reference_data = {}
+    for name, future in futures.items():
+        try:
+            reference_data[name] = future.result()
+        except NetSuiteRequestError as e:
+            if name not in OPTIONAL_REFERENCE_DATA:
+                raise
+            message = e.message.replace("error", "failure").replace("Error", "")
+            logger.warning("It was not possible to retrieve %s data: %s", name, message)
+
+    return reference_data
+
+
+def get_reference_data(ns_client, input_data, config):
+    logger.info("Readding data from API...")
+    cache = get_reference_cache(ns_client, config)
+    fetched_at = {k: v[0] for k, v in cache.items()}
+    workers = config.get("reference_workers", 5)
+
+    jobs = {}
+    if "Location" in input_data.columns:
+        if not input_data["Location"].dropna().empty:
+            jobs["Locations"] = (["name"], None)
+
+    if not input_data["Customer Name"].dropna().empty:
+        jobs["Customer"] = (["name", "companyName"], None)
+
     if not input_data["Class"].dropna().empty:
-        reference_data["Classifications"] = ns_client.entities["Classifications"](ns_client.client).get_all(["name"])
-    
+        jobs["Classifications"] = (["name"], None)
+
     if not input_data["Currency"].dropna().empty:
-        reference_data["Currencies"] = ns_client.entities["Currencies"](ns_client.client).get_all()
-    
+        jobs["Currencies"] = (None, flatten_currencies)
+
     if "Department" in input_data.columns:
         if not input_data["Department"].dropna().empty:
-            reference_data["Departments"] = ns_client.entities["Departments"](ns_client.client).get_all(["name"])
-        
+            jobs["Departments"] = (["name"], None)
+
+    # Accounts switches the shared client to full record searches,
+    # so it only runs once the body fields searches are done
+    account_jobs = {}
     if not input_data["Account Number"].dropna().empty or not input_data["Account Name"].dropna().empty:
-        reference_data["Accounts"] = ns_client.entities["Accounts"](ns_client.client).get_all(["acctName", "acctNumber", "subsidiaryList"])
+        account_jobs["Accounts"] = (["acctName", "acctNumber", "subsidiaryList"], flatten_accounts)
+
+    reference_data = fetch_reference_data(ns_client, cache, jobs, workers)
+    reference_data.update(fetch_reference_data(ns_client, cache, account_jobs, workers))
+
+    if fetched_at != {k: v[0] for k, v in cache.items()}:
+        save_reference_cache(config, cache)
+
+    return index_reference_data(reference_data, input_data)
+
+
+def get_default_subsidiary(account):
+    subsidiary_list = account.get("subsidiaryList")
+    if not subsidiary_list:
+        return None
+    if isinstance(subsidiary_list, list):
+        return subsidiary_list[0]
+    subsidiary = subsidiary_list["recordRef"]
+    return subsidiary[0] if subsidiary else None
+
+
+def flatten_accounts(accounts):
+    # Keep only the fields build_lines needs and resolve the default subsidiary once
+    return [
+        {
+            "acctName": a.get("acctName"),
+            "acctNumber": a.get("acctNumber"),
+            "externalId": a.get("externalId"),
+            "internalId": a.get("internalId"),
+            "subsidiary": get_default_subsidiary(a),
+        }
+        for a in accounts
+    ]
+
+
+def flatten_currencies(currencies):
+    # Currencies come back as SOAP records, unwrap them to plain dicts
+    return [
+        {
+            "symbol": c["symbol"],
+            "externalId": c["externalId"],
+            "internalId": c["internalId"],
+        }
+        for c in currencies
+    ]
+
+
+def index_by(records, key):
+    # Keep the first record for each key, same as taking [0] of a filtered list
+    index = {}
+    for record in records:
+        if record[key] is not None:
+            index.setdefault(record[key], record)
+    return index
+
+
+def get_value(row, col):
+    # Missing columns and empty cells both read as None
+    value = row.get(col)
+    return None if pd.isna(value) else value
+
+
+def match_input_values(values, index, n=20, cutoff=0.7):
+    # Fuzzy match each distinct CSV value once rather than once per line
+    names = [name for name in index if name]
+    matches = {}
+    for value in values.dropna().unique():
+        close_matches = get_close_matches(value, names, n=n, cutoff=cutoff)
+        if close_matches:
+            matches[value] = index[max(close_matches, key=close_matches.get)]
+    return matches
+
+
+def index_reference_data(reference_data, input_data):
+    # Build the lookup dicts once so build_lines doesn't scan the lists per row
+    if reference_data.get("Accounts"):
+        # Accounts are kept columnar so they can be joined onto the CSV, see join_accounts
+        reference_data["AccountsFrame"] = pd.DataFrame(reference_data["Accounts"]).rename(
+            columns={"externalId": "acctExternalId", "internalId": "acctInternalId", "subsidiary": "acctSubsidiary"}
+        )
+    if reference_data.get("Classifications"):
+        reference_data["ClassificationsByName"] = index_by(reference_data["Classifications"], "name")
+        reference_data["ClassificationsByValue"] = match_input_values(
+            input_data["Class"], reference_data["ClassificationsByName"]
+        )
+    if reference_data.get("Departments"):
+        reference_data["DepartmentsByName"] = index_by(reference_data["Departments"], "name")
+        reference_data["DepartmentsByValue"] = match_input_values(
+            input_data["Department"], reference_data["DepartmentsByName"]
+        )
+    if reference_data.get("Locations"):
+        reference_data["LocationsByName"] = index_by(reference_data["Locations"], "name")
+    if reference_data.get("Currencies"):
+        reference_data["CurrenciesBySymbol"] = index_by(reference_data["Currencies"], "symbol")
+    if reference_data.get("Customer"):
+        customers = {}
+        for c in reference_data["Customer"]:
+            customer_name = c["name"] if "name" in c.keys() else c["companyName"]
+            if customer_name:
+                customers.setdefault(customer_name, c)
+        reference_data["CustomerByName"] = customers
+        reference_data["CustomerByValue"] = match_input_values(
+            input_data["Customer Name"], customers, n=2, cutoff=0.95
+        )
 
     return reference_data
 
 
-def build_lines(x, ref_data):
+def join_accounts(input_data, reference_data):
+    # Match the account of every line with one join instead of per-row lookups
+    accounts = reference_data.get("AccountsFrame")
+    if accounts is None:
+        return input_data
+
+    # Keep the first account for each key, same as the previous [0] of a filtered list
+    by_number = accounts.dropna(subset=["acctNumber"]).drop_duplicates("acctNumber")
+    by_name = accounts.dropna(subset=["acctName"]).drop_duplicates("acctName")
+    numbers = input_data[["Account Number"]].merge(
+        by_number, how="left", left_on="Account Number", right_on="acctNumber"
+    )
+    names = input_data[["Account Name"]].merge(
+        by_name, how="left", left_on="Account Name", right_on="acctName"
+    )
+
+    # Account Number takes precedence over Account Name when both are set
+    use_number = input_data["Account Number"].notna().to_numpy()
+    input_data = input_data.copy()
+    for col in ACCOUNT_REF_COLS:
+        values = numbers[col].where(use_number, names[col]).astype(object)
+        # Missing fields go back to None, NaN must not reach the RecordRef
+        input_data[col] = pd.Series(values.where(values.notna(), None), dtype=object, index=input_data.index)
+    return input_data
+
+
+def build_lines(x, ref_data, has_description, has_date):
 
     line_items = []
     subsidiaries = {}
+    cols = list(x.columns)
+
+    if has_date:
+        created_date = pd.to_datetime(x["Transaction Date"].iloc[0])
+    else:
+        created_date = None
+
+    # Get the currency ID, the whole journal shares one currency
+    currency_ref = None
+    currency = x["Currency"].dropna() if "Currency" in cols else None
+    if ref_data.get("Currencies") and currency is not None and not currency.empty:
+        currency_data = ref_data["CurrenciesBySymbol"].get(currency.iloc[0])
+        if currency_data:
+            currency_ref = {
+                "name": currency_data.get("symbol"),
+                "externalId": currency_data.get("externalId"),
+                "internalId": currency_data.get("internalId"),
+            }
+
+    # Resolve the Posting Type for the whole journal at once
+    posting_types = x["Posting Type"].str.lower()
+    is_credit = posting_types.eq("credit").to_numpy()
+    is_debit = posting_types.eq("debit").to_numpy()
+    # Python round, the posted amounts must not change at half-cent boundaries
+    amounts = [abs(round(v, 2)) for v in x["Amount"].fillna(0).to_numpy().tolist()]
+
+    has_accounts = "acctInternalId" in cols
+    classes = ref_data.get("ClassificationsByValue", {})
+    departments = ref_data.get("DepartmentsByValue", {})
+    locations = ref_data.get("LocationsByName", {})
+    customers = ref_data.get("CustomerByValue", {})
+
     # Create line items
-    for _, row in x.iterrows():
+    for i, values in enumerate(x.itertuples(index=False, name=None)):
+        row = dict(zip(cols, values))
+        acct_num = get_value(row, "Account Number")
+        acct_name = get_value(row, "Account Name")
+
         #  Using Account Number if provided 
-        if ref_data.get("Accounts") and row.get("Account Number") and not pd.isna(row.get("Account Number")):
-            acct_num = str(row["Account Number"])
-            acct_data = [a for a in ref_data["Accounts"] if a["acctNumber"] == acct_num]
-            if not acct_data:
-                logger.warning(f"{acct_num} is not valid for this netsuite account, skipping line")
+        if has_accounts and acct_num:
+            if pd.isna(row["acctInternalId"]):
+                logger.warning("%s is not valid for this netsuite account, skipping line", acct_num)
                 continue
 
         # Using Account Name if provided
-        elif ref_data.get("Accounts") and row.get("Account Name") and not pd.isna(row.get("Account Name")):
-            acct_name = str(row["Account Name"])
-            acct_data = [a for a in ref_data["Accounts"] if a["acctName"] == acct_name]
-            if not acct_data:
-                logger.warning(f"{acct_name} is not valid for this netsuite account, skipping line")
+        elif has_accounts and acct_name:
+            if pd.isna(row["acctInternalId"]):
+                logger.warning("%s is not valid for this netsuite account, skipping line", acct_name)
                 continue
         else: 
             raise TypeError(f"Account Number or Account Name is required")
 
-        acct_data = acct_data[0]
+        # The account columns were joined in by join_accounts
         ref_acct = {
-            "name": acct_data.get("acctName"),
-            "externalId": acct_data.get("externalId"),
-            "internalId": acct_data.get("internalId"),
+            "name": row["acctName"],
+            "externalId": row["acctExternalId"],
+            "internalId": row["acctInternalId"],
         }
         journal_entry_line = {"account": ref_acct}
 
         # Extract the subsidiaries from Account
-        if not pd.isna(row.get("Subsidiary")):
-            subsidiary = dict(name=None, internalId=row.get("Subsidiary"), externalId=None, type=None)
+        subsidiary_id = get_value(row, "Subsidiary")
+        if subsidiary_id is not None:
+            subsidiary = dict(name=None, internalId=subsidiary_id, externalId=None, type=None)
         else:
-            if acct_data['subsidiaryList']:
-                if isinstance(acct_data['subsidiaryList'], list):
-                    subsidiary = acct_data['subsidiaryList'][0]
-                else:
-                    subsidiary = acct_data['subsidiaryList']['recordRef']
-                    subsidiary = subsidiary[0] if subsidiary else None
-            else:
-                subsidiary = None
+            subsidiary = row["acctSubsidiary"]
         if subsidiary:
-            if row["Posting Type"].lower() == "credit":
+            if is_credit[i]:
                 subsidiaries["toSubsidiary"] = subsidiary
-            elif row["Posting Type"].lower() == "debit":
+            elif is_debit[i]:
                 subsidiaries["subsidiary"] = subsidiary
             else:
-                raise('Posting Type must be "credit" or "debit"')
-
-        # Get the NetSuite Class Ref
-        if ref_data.get("Classifications") and row.get("Class") and not pd.isna(row.get("Class")):
-            class_names = [c["name"] for c in ref_data["Classifications"]]
-            class_name = get_close_matches(row["Class"], class_names)
-            if class_name:
-                class_name = max(class_name, key=class_name.get)
-                class_data = [c for c in ref_data["Classifications"] if c["name"]==class_name]
-                if class_data:
-                    class_data = class_data[0]
-                    journal_entry_line["class"] = {
-                        "name": class_data.get("name"),
-                        "externalId": class_data.get("externalId"),
-                        "internalId": class_data.get("internalId"),
-                    }
+                raise ValueError('Posting Type must be "credit" or "debit"')
+
+        # Get the NetSuite Class Ref, empty cells never match an index key
+        class_data = classes.get(row.get("Class"))
+        if class_data:
+            journal_entry_line["class"] = {
+                "name": class_data.get("name"),
+                "externalId": class_data.get("externalId"),
+                "internalId": class_data.get("internalId"),
+            }
 
         # Get the NetSuite Department Ref
-        if ref_data.get("Departments") and row.get("Department") and not pd.isna(row.get("Department")):
-            dept_names = [d["name"] for d in ref_data["Departments"]]
-            dept_name = get_close_matches(row["Department"], dept_names)
-            if dept_name:
-                dept_name = max(dept_name, key=dept_name.get)
-                dept_data = [d for d in ref_data["Departments"] if d["name"] == dept_name]
-                if dept_data:
-                    dept_data = dept_data[0]
-                    journal_entry_line["department"] = {
-                        "name": dept_data.get("name"),
-                        "externalId": dept_data.get("externalId"),
-                        "internalId": dept_data.get("internalId"),
-                    }
+        dept_data = departments.get(row.get("Department"))
+        if dept_data:
+            journal_entry_line["department"] = {
+                "name": dept_data.get("name"),
+                "externalId": dept_data.get("externalId"),
+                "internalId": dept_data.get("internalId"),
+            }
 
         # Get the NetSuite Location Ref
-        if ref_data.get("Locations") and row.get("Location") and not pd.isna(row.get("Location")):
-            loc_data = [l for l in ref_data["Locations"] if l["name"] == row["Location"]]
-            if loc_data:
-                loc_data = loc_data[0]
-                journal_entry_line["location"] = {
-                    "name": loc_data.get("name"),
-                    "externalId": loc_data.get("externalId"),
-                    "internalId": loc_data.get("internalId"),
-                }
+        loc_data = locations.get(row.get("Location"))
+        if loc_data:
+            journal_entry_line["location"] = {
+                "name": loc_data.get("name"),
+                "externalId": loc_data.get("externalId"),
+                "internalId": loc_data.get("internalId"),
+            }
 
-        # Get the NetSuite Location Ref
-        if ref_data.get("Customer") and row.get("Customer Name") and not pd.isna(row.get("Customer Name")):
-
-            customer_names = []
-            for c in ref_data["Customer"]:
-                if "name" in c.keys():
-                    if c["name"]:
-                        customer_names.append(c["name"])
-                else:
-                    if c["companyName"]:
-                        customer_names.append(c["companyName"])
-            customer_name = get_close_matches(row["Customer Name"], customer_names, n=2, cutoff=0.95)
-            if customer_name:
-                customer_name = max(customer_name, key=customer_name.get)
-                customer_data = []
-                for c in ref_data["Customer"]:
-                    if "name" in c.keys():
-                        if c["name"] == customer_name:
-                            customer_data.append(c)
-                    else:
-                        if c["companyName"] == customer_name:
-                            customer_data.append(c)
-                if customer_data:
-                    customer_data = customer_data[0]
-                    journal_entry_line["entity"] = {
-                        "externalId": customer_data.get("externalId"),
-                        "internalId": customer_data.get("internalId"),
-                    }
+        # Get the NetSuite Customer Ref
+        customer_data = customers.get(row.get("Customer Name"))
+        if customer_data:
+            journal_entry_line["entity"] = {
+                "externalId": customer_data.get("externalId"),
+                "internalId": customer_data.get("internalId"),
+            }
 
         # Check the Posting Type and insert the Amount
-        amount = 0 if pd.isna(row["Amount"]) else abs(round(row["Amount"], 2))
-        if row["Posting Type"].lower() == "credit":
-            journal_entry_line["credit"] = amount
-        elif row["Posting Type"].lower() == "debit":
-            journal_entry_line["debit"] = amount
+        if is_credit[i]:
+            journal_entry_line["credit"] = amounts[i]
+        elif is_debit[i]:
+            journal_entry_line["debit"] = amounts[i]
 
         # Insert the Journal Entry to the memo field
-        if "Description" in x.columns:
+        if has_description:
             journal_entry_line["memo"] = row["Description"]
         
         line_items.append(journal_entry_line)
 
-    # Get the currency ID
-    if ref_data.get("Currencies") and row.get("Currency"):
-        currency_data = [
-            c for c in ref_data["Currencies"] if c["symbol"] == row["Currency"]
-            ]
-        if currency_data:
-            currency_data = currency_data[0]
-            currency_ref = {
-                "name": currency_data.get("symbol"),
-                "externalId": currency_data.get("externalId"),
-                "internalId": currency_data.get("internalId"),
-            }
-    else:
-        currency_ref = None
-
     # Check if subsidiary is duplicated and delete toSubsidiary if true
     if len(subsidiaries)>1:
         if subsidiaries['subsidiary'] == subsidiaries['toSubsidiary']:
             del subsidiaries['toSubsidiary']
 
-    if "Transaction Date" in x.columns:
-        created_date = pd.to_datetime(x["Transaction Date"].iloc[0])
-    else:
-        created_date = None
-
     # Create the journal entry
     journal_entry = {
         "createdDate": created_date,
@@ -301,16 +547,25 @@ def build_lines(x, ref_data):
 
 
 def load_journal_entries(input_data, reference_data):
+    input_data = join_accounts(input_data, reference_data)
+
+    # The columns are the same for every journal, check them once
+    has_description = "Description" in input_data.columns
+    has_date = "Transaction Date" in input_data.columns
+
     # Build the entries
     try:
-        lines = input_data.groupby(["Journal Entry Id"]).apply(build_lines, reference_data)
+        lines = [
+            build_lines(group, reference_data, has_description, has_date)
+            for _, group in input_data.groupby("Journal Entry Id", sort=False)
+        ]
     except RuntimeError as e:
         raise Exception("Building Netsuite JournalEntries failed!")
 
     # Print journal entries
-    logger.info(f"Loaded {len(lines)} journal entries to post")
+    logger.info("Loaded %s journal entries to post", len(lines))
 
-    return lines.values
+    return lines
 
 
 def post_journal_entries(journal, ns_client):
@@ -324,41 +579,125 @@ def read_input_data(config):
     # Get input path
     input_path = f"{config['input_path']}/JournalEntries.csv"
     # Read the passed CSV
-    input_data = pd.read_csv(input_path)
-    cols = list(input_data.columns)
-    REQUIRED_COLS = [
-        "Transaction Date",
-        "Journal Entry Id",
-        "Customer Name",
-        "Class",
-        "Account Number",
-        "Account Name",
-        "Posting Type",
-        "Description",
-    ]
-    # Verify it has required columns
-    if not all(col in cols for col in REQUIRED_COLS):
+    input_data = pd.read_csv(input_path, usecols=lambda c: c in INPUT_COLS, dtype=INPUT_DTYPES)
+    return prepare_input_data(input_data)
+
+
+def read_input_chunks(config):
+    # Get input path
+    input_path = f"{config['input_path']}/JournalEntries.csv"
+    reader = pd.read_csv(
+        input_path,
+        usecols=lambda c: c in INPUT_COLS,
+        dtype=INPUT_DTYPES,
+        chunksize=config["chunksize"],
+    )
+
+    # The last journal of a chunk may continue in the next one,
+    # so its rows are held back until the next chunk is read
+    pending = None
+    yielded = set()
+    for chunk in reader:
+        chunk = prepare_input_data(chunk)
+        if chunk.empty:
+            continue
+        if pending is not None:
+            chunk = pd.concat([pending, chunk], ignore_index=True)
+        is_last = chunk["Journal Entry Id"].eq(chunk["Journal Entry Id"].iloc[-1])
+        pending = chunk[is_last]
+        if not is_last.all():
+            check_streamed_ids(chunk[~is_last], yielded)
+            yield chunk[~is_last]
+
+    if pending is not None:
+        check_streamed_ids(pending, yielded)
+        yield pending
+
+
+def check_streamed_ids(input_data, yielded):
+    # A journal split across the file would be upserted as several partial
+    # entries with the same externalId, each overwriting the previous one
+    ids = set(input_data["Journal Entry Id"].dropna().unique())
+    repeated = ids & yielded
+    if repeated:
         logger.error(
-            f"CSV is mising REQUIRED_COLS. Found={json.dumps(cols)}, Required={json.dumps(REQUIRED_COLS)}"
+            "Journal Entry Id rows must be contiguous when chunksize is set. Repeated=%s",
+            json.dumps(sorted(repeated)),
         )
         sys.exit(1)
-    
+    yielded.update(ids)
+
+
+def prepare_input_data(input_data):
+    # Verify it has required columns
+    missing_cols = set(REQUIRED_COLS) - set(input_data.columns)
+    if missing_cols:
+        logger.error("CSV is mising REQUIRED_COLS. Missing=%s", json.dumps(sorted(missing_cols)))
+        sys.exit(1)
+
     return input_data
 
 
+def iter_journals(config, ns_client):
+    chunk_config = config
+    for chunk in read_input_chunks(config):
+        # Reference data is memoized, only new entities are fetched per chunk
+        reference_data = get_reference_data(ns_client, chunk, chunk_config)
+        yield from load_journal_entries(chunk, reference_data)
+        # Later chunks fetch while posts are in flight, keep to one extra request
+        chunk_config = dict(config, reference_workers=1)
+
+
 def upload_journals(config, ns_client):
-    # Read input data
-    input_data = read_input_data(config)
-    
-    # Load reference data
-    reference_data = get_reference_data(ns_client, input_data)
+    if config.get("chunksize"):
+        # Stream the CSV so posting starts while the rest is still being read
+        journals = iter_journals(config, ns_client)
+    else:
+        # Read input data
+        input_data = read_input_data(config)
+
+        # Load reference data
+        reference_data = get_reference_data(ns_client, input_data, config)
 
-    # Load Journal Entries CSV to post + Convert to NetSuite format
-    journals = load_journal_entries(input_data, reference_data)
+        # Load Journal Entries CSV to post + Convert to NetSuite format
+        journals = load_journal_entries(input_data, reference_data)
 
     # Post the journal entries to Netsuite
-    for journal in journals:
-        post_journal_entries(journal, ns_client)
+    post_journals(config, journals, ns_client)
+
+
+def collect_posts(done, pending, failed):
+    for future in done:
+        external_id = pending.pop(future)
+        try:
+            future.result()
+        except Exception as e:
+            logger.error("Posting JournalEntry %s failed: %s", external_id, e)
+            failed.append(external_id)
+
+
+def post_journals(config, journals, ns_client):
+    workers = config.get("post_workers", 5)
+    pending = {}
+    failed = []
+    total = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            for journal in journals:
+                # Bound the journals waiting to be posted so a streamed CSV isn't buffered whole
+                if len(pending) >= 2 * workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect_posts(done, pending, failed)
+                pending[executor.submit(post_journal_entries, journal, ns_client)] = journal["externalId"]
+                total += 1
+        finally:
+            # Collect the posts in flight even when building a later journal failed
+            collect_posts(as_completed(list(pending)), pending, failed)
+            if failed:
+                logger.error("Posting Netsuite JournalEntries failed for %s of %s entries!", len(failed), total)
+
+    if failed:
+        raise Exception(f"Posting Netsuite JournalEntries failed for {len(failed)} of {total} entries!")
 
 
 def upload(config, args):
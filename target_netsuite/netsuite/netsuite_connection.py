@@ -32,6 +32,9 @@ class ExtendedNetSuiteConnection:
             'Departments': Departments
         }
 
+        # Reference entities fetched with this connection, see get_reference_cache
+        self.reference_cache = None
+
     def _query_entity(self, data, entity, stream):
         to_get_results_for = data.get(stream)
         for element in to_get_results_for: